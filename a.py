@@ -11,98 +11,120 @@
         5) Display the preview image.
 
     Notes:
-    - Requires: solidpython, matplotlib, pandas, numpy
+    - Requires: solidpython, matplotlib, numpy, pillow
     - Optional: OpenSCAD in PATH to auto-export STL/PNG from .scad (the script won't fail without it).
     """
 
     import re
+    import csv
     import os
     import math
     import datetime
+    import hashlib
+    import shutil
     import subprocess
+    import threading
+    from functools import lru_cache
+    from types import MappingProxyType
     import numpy as np
-    import matplotlib.pyplot as plt
-    from matplotlib.patches import Polygon, Circle, Rectangle
-    import pandas as pd
 
-    # SolidPython imports
-    from solid import scad_render_to_file, linear_extrude, difference, union, translate, cylinder, polygon, circle, cube
-    from solid import *  # for convenience
-    from solid.utils import *  # translate, up, etc.
+    # matplotlib and SolidPython are imported lazily inside the functions that
+    # need them, so parsing a prompt doesn't pay their import time
+
+    # ---------- Material properties ----------
+    MATERIAL_DENSITY = {
+        'aluminum': 2.7,   # g/cm^3
+        'steel': 7.85      # g/cm^3
+    }
+    MATERIAL_YIELD_STRENGTH = {
+        'aluminum': 150,   # MPa
+        'steel': 250       # MPa
+    }
+
+    # Precompiled prompt patterns
+    # one alternation for part-type and material keywords; the earliest
+    # entry in each *_PRIORITY tuple wins when several are present.
+    # The leading lookahead lets re skip positions that can't start a match.
+    _PAT_KEYWORDS = re.compile(
+        r'(?=[ablprst])(?:(?P<arm>\barm\b)'
+        r'|(?P<l_bracket>\bl-?bracket\b|\bl bracket\b)'
+        r'|(?P<circle>\bplate\b)'
+        r'|(?P<rectangle>\brectangl|bar\b)'
+        r'|(?P<trapezoid>\btrapezoid\b|\bbracket\b)'
+        r'|(?P<steel>steel)'
+        r'|(?P<aluminum>alumini?um))'
+    )
+    _PART_TYPE_PRIORITY = ('arm', 'l_bracket', 'circle', 'rectangle', 'trapezoid')
+    _MATERIAL_PRIORITY = ('steel', 'aluminum')
+    # all numeric fields in one scan; keyword prefixes only look ahead at
+    # their number so the "<n>mm" alternatives still see it
+    _PAT_FIELDS = re.compile(
+        r'(?=[\dwts])(?:(?P<dia>\d+)(?= ?mm ?(?:hole|diameter|dia))'
+        r'|(?P<mm>\d+) ?mm'
+        r'|width(?: ?[:=]? ?|of ?)(?=(?P<width>\d+) ?mm)'
+        r'|thickness ?[:=]? ?(?=(?P<thickness>\d+) ?mm)'
+        r'|(?P<bolt>\d+) ?[- ]?bolt|\b(?P<holes>\d+) ?holes?\b'
+        r'|supports ?(?:up to ?)?(?P<force>\d+) ?n)'
+    )
+    _FIELD_KEYS = {
+        'dia': 'hole_diameter',
+        'width': 'width',
+        'thickness': 'thickness',
+        'bolt': 'hole_count',
+        'holes': 'hole_count',
+        'force': 'target_force_n',
+    }
+    _PAT_LENGTH_WORD = re.compile(r'(\d+) ?(?:long|length|l\b)')
 
     # ---------- Simple prompt -> params parser ----------
+    # parsing is pure in the prompt string: cache it and hand out a read-only
+    # view so one caller can't change another caller's params
+    @lru_cache(maxsize=256)
     def parse_prompt(prompt: str):
-        p = prompt.lower()
+        # lowercase and collapse whitespace runs to single spaces, so the
+        # patterns above only ever need to allow one optional space
+        p = ' '.join(prompt.lower().split())
         params = {}
 
-        # part type (arm, bracket, plate, rectangle, trapezoid, l-bracket)
-        if re.search(r'\barm\b', p):
-            params['part_type'] = 'arm'
-        elif re.search(r'\bl-?bracket\b|\bl bracket\b', p):
-            params['part_type'] = 'l_bracket'
-        elif re.search(r'\bplate\b', p):
-            params['part_type'] = 'circle'
-        elif re.search(r'\brectangl|bar\b', p):
-            params['part_type'] = 'rectangle'
-        elif re.search(r'\btrapezoid\b|\bbracket\b', p):
-            params['part_type'] = 'trapezoid'
-        else:
-            params['part_type'] = 'trapezoid'
-
-        # numeric fields: mm and counts
-        m = re.search(r'(\d+)\s*mm', p)
-        if m:
-            params['length'] = int(m.group(1))
+        # keywords: part type (arm, bracket, plate, rectangle, trapezoid, l-bracket) and material
+        keywords = {m.lastgroup for m in _PAT_KEYWORDS.finditer(p)}
+        params['part_type'] = next((t for t in _PART_TYPE_PRIORITY if t in keywords), 'trapezoid')
+
+        # numeric fields: mm, counts and force in a single pass
+        found = {}
+        mm_values = []
+        for m in _PAT_FIELDS.finditer(p):
+            kind = m.lastgroup
+            value = int(m.group(kind))
+            if kind in ('mm', 'dia'):
+                mm_values.append(value)
+            key = _FIELD_KEYS.get(kind)
+            if key is not None:
+                found.setdefault(key, value)
+
+        if mm_values:
+            params['length'] = mm_values[0]
         else:
             # look for plain numbers that may indicate length
-            m2 = re.search(r'(\d+)\s*(?:long|length|l\b)', p)
-            params['length'] = int(m2.group(1)) if m2 else 120
+            m = _PAT_LENGTH_WORD.search(p)
+            params['length'] = int(m.group(1)) if m else 120
 
         # width (mm)
-        m = re.search(r'width(?:\s*[:=]?\s*|of\s*)(\d+)\s*mm', p)
-        if m:
-            params['width'] = int(m.group(1))
-        else:
-            # fallback: parse "<number>mm" second occurrence
-            mm_all = re.findall(r'(\d+)\s*mm', p)
-            if len(mm_all) >= 2:
-                params['width'] = int(mm_all[1])
-            else:
-                params['width'] = 40
-
-        # thickness
-        m = re.search(r'thickness\s*[:=]?\s*(\d+)\s*mm', p)
-        if m:
-            params['thickness'] = int(m.group(1))
+        if 'width' in found:
+            params['width'] = found['width']
         else:
-            params['thickness'] = 5
-
-        # holes (count)
-        m = re.search(r'(\d+)\s*[- ]?bolt|\b(\d+)\s*holes?\b', p)
-        if m:
-            # m can capture in different groups; pick the first numeric group that's not None
-            nums = [g for g in m.groups() if g is not None]
-            params['hole_count'] = int(nums[0]) if nums else 0
-        else:
-            # "3-bolt" style earlier
-            m2 = re.search(r'(\d+)-bolt', p)
-            params['hole_count'] = int(m2.group(1)) if m2 else 3
+            # fallback: second "<number>mm" occurrence
+            params['width'] = mm_values[1] if len(mm_values) >= 2 else 40
 
-        # hole diameter
-        m = re.search(r'(\d+)\s*mm\s*(?:hole|diameter|dia)', p)
-        params['hole_diameter'] = int(m.group(1)) if m else 6
+        params['thickness'] = found.get('thickness', 5)
+        params['hole_count'] = found.get('hole_count', 3)
+        params['hole_diameter'] = found.get('hole_diameter', 6)
 
         # material
-        if 'steel' in p:
-            params['material'] = 'steel'
-        elif 'aluminium' in p or 'aluminum' in p:
-            params['material'] = 'aluminum'
-        else:
-            params['material'] = 'aluminum'
+        params['material'] = next((t for t in _MATERIAL_PRIORITY if t in keywords), 'aluminum')
 
         # target force (N)
-        m = re.search(r'supports\s*(?:up to\s*)?(\d+)\s*n', p)
-        params['target_force_n'] = int(m.group(1)) if m else 2000
+        params['target_force_n'] = found.get('target_force_n', 2000)
 
         # shape-specific fallback defaults
         # If trapezoid/arm, keep width_left/width_right
@@ -118,57 +140,149 @@
             # use length as diameter for circle if provided
             params['circle_diameter'] = params.get('length', 80)
 
-        # ensure numeric types
-        for k,v in list(params.items()):
-            if isinstance(v, str) and v.isdigit():
-                params[k] = int(v)
+        return MappingProxyType(params)
+
+    # ---------- Hole layout (shared by preview and SCAD) ----------
+    # unit bolt-circle tables (cos, sin) for n holes; shared read-only between calls
+    @lru_cache(maxsize=32)
+    def _ring_unit(n):
+        ang = 2 * np.pi * np.arange(n) / n
+        cos_t, sin_t = np.cos(ang), np.sin(ang)
+        cos_t.flags.writeable = sin_t.flags.writeable = False
+        return cos_t, sin_t
 
-        return params
+    def _hole_positions(params):
+        # all hole centres at once as NumPy arrays (xs, ys)
+        ptype = params['part_type']
+        hc = int(params.get('hole_count', 0))
+        idx = np.arange(hc)
+        if ptype in ('arm','trapezoid'):
+            # evenly spaced along the length, on the mid line
+            xs = (idx + 1) * params['length'] / (hc + 1)
+            ys = np.full(hc, (params['width_left'] + params['width_right']) / 4.0)
+        elif ptype == 'rectangle':
+            xs = (idx + 1) * params['length'] / (hc + 1)
+            ys = np.full(hc, params['rect_width'] / 2.0)
+        elif ptype == 'circle' and hc > 0:
+            # bolt circle at half the plate radius
+            ring_r = params['circle_diameter'] / 2.0 * 0.5
+            cos_t, sin_t = _ring_unit(hc)
+            xs = ring_r * cos_t; ys = ring_r * sin_t
+        else:
+            xs = ys = np.empty(0)
+        return xs, ys
 
     # ---------- 2D preview generator (matplotlib) ----------
+    # A single preview figure is created on first use and cleared for every
+    # part. It renders straight to an Agg canvas, so no pyplot/GUI backend
+    # is involved in writing the PNG. The lock serialises callers on different
+    # threads, since they would otherwise draw into the same axes.
+    _PREVIEW_FIG = None
+    _PREVIEW_LOCK = threading.Lock()
+
+    def _preview_axes():
+        global _PREVIEW_FIG
+        if _PREVIEW_FIG is None:
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            _PREVIEW_FIG = Figure(figsize=(6,3))
+            FigureCanvasAgg(_PREVIEW_FIG)
+            _PREVIEW_FIG.add_subplot()
+        ax = _PREVIEW_FIG.axes[0]
+        ax.clear()
+        return _PREVIEW_FIG, ax
+
     def generate_2d_preview(params, out_png):
-        fig, ax = plt.subplots(figsize=(6,3))
-        ptype = params['part_type']
+        from matplotlib.patches import Polygon, Circle, Rectangle
+        from matplotlib.collections import EllipseCollection
+
+        with _PREVIEW_LOCK:
+            fig, ax = _preview_axes()
+            ptype = params['part_type']
 
+            if ptype in ('arm','trapezoid'):
+                L = params['length']; wL = params['width_left']; wR = params['width_right']
+                pts = np.array([[0, 0], [L, 0], [L, wR], [0, wL]], dtype=np.float64)
+                ax.add_patch(Polygon(pts, closed=True, facecolor='lightgrey', edgecolor='black'))
+                ax.set_xlim(-10, L+10); ax.set_ylim(-10, max(wL,wR)+10)
+
+            elif ptype == 'rectangle':
+                L = params['length']; W = params['rect_width']
+                ax.add_patch(Rectangle((0,0), L, W, facecolor='lightgrey', edgecolor='black'))
+                ax.set_xlim(-10, L+10); ax.set_ylim(-10, W+10)
+
+            elif ptype == 'circle':
+                D = params['circle_diameter']; r = D/2.0
+                ax.add_patch(Circle((0,0), radius=r, facecolor='lightgrey', edgecolor='black'))
+                ax.set_xlim(-r-10, r+10); ax.set_ylim(-r-10, r+10)
+
+            # holes: one collection instead of one Circle patch per hole
+            xs, ys = _hole_positions(params)
+            if len(xs):
+                d = np.full(len(xs), float(params.get('hole_diameter', 6)))
+                ax.add_collection(EllipseCollection(d, d, 0, units='xy', offsets=np.column_stack([xs, ys]),
+                                                    offset_transform=ax.transData, facecolor='white', edgecolor='black'))
+
+            ax.set_aspect('equal'); ax.axis('off')
+            # with the axis off nothing draws outside the axes box, so the crop
+            # 'tight' would find is that box (once the aspect is applied) plus its
+            # 0.1in pad; computing it here skips savefig's extra layout pass
+            ax.apply_aspect()
+            crop = ax.get_position().transformed(fig.transFigure - fig.dpi_scale_trans).padded(0.1)
+            fig.savefig(out_png, dpi=100, bbox_inches=crop)
+            # savefig left the saved image in the canvas buffer; copy it while we
+            # still hold the lock, so the caller can show it without a redraw
+            return np.array(fig.canvas.buffer_rgba())
+
+    # ---------- 2D preview generator (Pillow) ----------
+    # Same drawing as generate_2d_preview, rasterised straight into a Pillow
+    # image: one pass, no matplotlib import and no tight-bbox re-render.
+    # World coordinates map to pixels with a single scale and a y flip.
+    # Part types it doesn't know fall back to the matplotlib preview.
+    def _fast_preview(params, out_png):
+        from PIL import Image, ImageDraw
+
+        ptype = params['part_type']
         if ptype in ('arm','trapezoid'):
             L = params['length']; wL = params['width_left']; wR = params['width_right']
             pts = [(0, 0), (L, 0), (L, wR), (0, wL)]
-            ax.add_patch(Polygon(pts, closed=True, facecolor='lightgrey', edgecolor='black'))
-            # holes
-            hc = params.get('hole_count', 0); hr = params.get('hole_diameter',6)/2.0
-            for i in range(hc):
-                x = (i+1) * L / (hc+1)
-                y = (wL + wR) / 4.0
-                ax.add_patch(Circle((x, y), radius=hr, facecolor='white', edgecolor='black'))
-
-            ax.set_xlim(-10, L+10); ax.set_ylim(-10, max(wL,wR)+10)
-
+            x0, x1, y0, y1 = -10, L+10, -10, max(wL,wR)+10
         elif ptype == 'rectangle':
             L = params['length']; W = params['rect_width']
-            ax.add_patch(Rectangle((0,0), L, W, facecolor='lightgrey', edgecolor='black'))
-            hc = params.get('hole_count', 0); hr = params.get('hole_diameter',6)/2.0
-            for i in range(hc):
-                x = (i+1) * L / (hc+1); y = W/2.0
-                ax.add_patch(Circle((x,y), radius=hr, facecolor='white', edgecolor='black'))
-            ax.set_xlim(-10, L+10); ax.set_ylim(-10, W+10)
-
+            pts = [(0, 0), (L, 0), (L, W), (0, W)]
+            x0, x1, y0, y1 = -10, L+10, -10, W+10
         elif ptype == 'circle':
-            D = params['circle_diameter']; r = D/2.0
-            ax.add_patch(Circle((0,0), radius=r, facecolor='lightgrey', edgecolor='black'))
-            hc = params.get('hole_count', 0); hr = params.get('hole_diameter',6)/2.0
-            if hc>0:
-                ring_r = r*0.5
-                for i in range(hc):
-                    ang = 2*math.pi*i/hc
-                    x = ring_r*math.cos(ang); y = ring_r*math.sin(ang)
-                    ax.add_patch(Circle((x,y), radius=hr, facecolor='white', edgecolor='black'))
-            ax.set_xlim(-r-10, r+10); ax.set_ylim(-r-10, r+10)
-
-        ax.set_aspect('equal'); ax.axis('off')
-        plt.savefig(out_png, dpi=200, bbox_inches='tight'); plt.close(fig)
+            r = params['circle_diameter']/2.0
+            pts = None
+            x0, x1, y0, y1 = -r-10, r+10, -r-10, r+10
+        else:
+            return generate_2d_preview(params, out_png)
+
+        # fit the view into 600x300 px, like the 6x3 in matplotlib figure
+        s = min(600 / (x1 - x0), 300 / (y1 - y0))
+        img = Image.new('RGB', (round((x1 - x0) * s), round((y1 - y0) * s)), 'white')
+        draw = ImageDraw.Draw(img)
+        if pts is None:
+            draw.ellipse([(-r - x0) * s, (y1 - r) * s, (r - x0) * s, (y1 + r) * s], fill='lightgrey', outline='black')
+        else:
+            draw.polygon([((x - x0) * s, (y1 - y) * s) for x, y in pts], fill='lightgrey', outline='black')
+
+        # holes
+        xs, ys = _hole_positions(params)
+        hr = float(params.get('hole_diameter', 6)) / 2.0 * s
+        for cx, cy in zip(((xs - x0) * s).tolist(), ((y1 - ys) * s).tolist()):
+            draw.ellipse([cx - hr, cy - hr, cx + hr, cy + hr], fill='white', outline='black')
+
+        img.save(out_png, optimize=False)
+        return img
 
     # ---------- SCAD builder (SolidPython) ----------
-    def build_scad(params):
+    _HOLE_GROUP = 8  # holes per union when subtracting
+
+    def _build_scad(params):
+        # SolidPython imports
+        from solid import linear_extrude, difference, union, translate, cylinder, polygon, circle
+
         ptype = params['part_type']
         thickness = float(params.get('thickness', 5))
 
@@ -196,91 +310,235 @@
         hole_r = float(params.get('hole_diameter',6))/2.0
         hole_objs = []
         if hole_count > 0:
-            if ptype in ('arm','trapezoid'):
-                for i in range(hole_count):
-                    x = (i+1) * L / (hole_count+1)
-                    y = (wL + wR) / 4.0
-                    hole_objs.append(translate([x, y, -1])(cylinder(r=hole_r, h=thickness + 2)))
-            elif ptype == 'rectangle':
-                for i in range(hole_count):
-                    x = (i+1) * L / (hole_count+1)
-                    y = W/2.0
-                    hole_objs.append(translate([x, y, -1])(cylinder(r=hole_r, h=thickness + 2)))
-            elif ptype == 'circle':
-                ring_r = r*0.5
-                for i in range(hole_count):
-                    ang = 2*math.pi*i/hole_count
-                    x = ring_r*math.cos(ang); y = ring_r*math.sin(ang)
-                    hole_objs.append(translate([x, y, -1])(cylinder(r=hole_r, h=thickness + 2)))
-
-        if hole_objs:
-            holes_union = union()(*hole_objs)
-            part = difference()(solid_base, holes_union)
-        else:
-            part = solid_base
+            xs, ys = _hole_positions(params)
+            # one cylinder node, shared by every translate (it renders the same each time)
+            cyl_proto = cylinder(r=hole_r, h=thickness + 2)
+            hole_objs = [translate([x, y, -1])(cyl_proto) for x, y in zip(xs.tolist(), ys.tolist())]
+            if hole_count > _HOLE_GROUP:
+                # sort by x so each group covers a compact strip of the part
+                order = np.argsort(xs, kind='stable').tolist()
+                hole_objs = [hole_objs[i] for i in order]
+
+        # subtract holes a group at a time; small nested differences are cheaper for CGAL than one wide union
+        part = solid_base
+        for i in range(0, len(hole_objs), _HOLE_GROUP):
+            part = difference()(part, union()(*hole_objs[i:i + _HOLE_GROUP]))
 
         return part
 
+    # build_scad is deterministic in the fields below, so identical parts reuse
+    # the SolidPython tree built the first time (it is only ever rendered,
+    # never modified). Oldest entries are dropped once the cache is full.
+    _SCAD_CACHE = {}
+    _SCAD_CACHE_SIZE = 128
+
+    def build_scad(params):
+        key = (params['part_type'], params.get('thickness', 5), params.get('length'), params.get('width_left'),
+               params.get('width_right'), params.get('rect_width'), params.get('circle_diameter'),
+               params.get('hole_count', 0), params.get('hole_diameter', 6))
+        part = _SCAD_CACHE.get(key)
+        if part is None:
+            part = _build_scad(params)
+            if len(_SCAD_CACHE) >= _SCAD_CACHE_SIZE:
+                del _SCAD_CACHE[next(iter(_SCAD_CACHE))]
+            _SCAD_CACHE[key] = part
+        return part
+
     # ---------- CSV logging ----------
     CSV_FILE = "parts_generated.csv"
+    # fixed column order: rows are only ever appended, so every row has to
+    # match the header that was written when the log was created
+    CSV_FIELDS = ("timestamp", "prompt", "part_type", "png", "scad", "stl", "net_area_mm2", "thickness_mm",
+                  "volume_cm3", "material", "weight_g", "max_force_n", "target_force_n", "status")
     def append_csv(row_dict):
-        df_new = pd.DataFrame([row_dict])
-        if os.path.exists(CSV_FILE):
-            df = pd.read_csv(CSV_FILE)
-            df = pd.concat([df, df_new], ignore_index=True)
+        # append-only: no need to re-read and rewrite the whole log
+        write_header = not os.path.exists(CSV_FILE)
+        with open(CSV_FILE, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+            if write_header:
+                writer.writeheader()
+            writer.writerow(row_dict)
+
+    # ---------- Weight / strength estimate ----------
+    # part-type codes used by _compute_metrics: 0 = arm/trapezoid, 1 = rectangle, 2 = circle
+    _PART_CODES = {'arm': 0, 'trapezoid': 0, 'rectangle': 1, 'circle': 2}
+
+    def _compute_metrics(part_code, L, wL, wR, rw, D, thickness, density, yield_s, target):
+        # plain scalars in, plain scalars out: no dict lookups on this path
+        if part_code == 0:
+            net_area_mm2 = 0.5 * (wL + wR) * L
+        elif part_code == 1:
+            net_area_mm2 = L * rw
+        else:
+            net_area_mm2 = math.pi * (D/2.0)**2
+        volume_cm3 = (net_area_mm2 * thickness) / 1000.0
+        weight_g = volume_cm3 * density
+        max_force = yield_s * net_area_mm2
+        return net_area_mm2, volume_cm3, weight_g, max_force, max_force >= target
+
+    # ---------- STL export (openscad) ----------
+    # STL exports wait in this queue as (csv row, stl path) until
+    # flush_scad_queue() runs them, so a batch of prompts pays the openscad
+    # startup cost in parallel instead of one after another
+    _SCAD_QUEUE = []
+    # every read-modify-write of the queue holds this, so threads calling
+    # run_from_prompt concurrently neither lose nor double-log a job
+    _QUEUE_LOCK = threading.Lock()
+
+    # STLs exported by openscad are kept in STL_CACHE_DIR under a hash of the
+    # SCAD text, so a part that was already rendered is copied instead of re-run
+    STL_CACHE_DIR = ".scad_cache"
+
+    def _export_stl(scad_name, stl_name):
+        try:
+            with open(scad_name, 'rb') as f:
+                text = f.read()
+            # skip the SolidPython header line, it carries a timestamp
+            if text.startswith(b'//'):
+                text = text.partition(b'\n')[2]
+            cache_stl = os.path.join(STL_CACHE_DIR, hashlib.blake2b(text, digest_size=8).hexdigest() + ".stl")
+            if os.path.exists(cache_stl):
+                shutil.copyfile(cache_stl, stl_name)
+                return True
+            subprocess.run(["openscad", "-o", stl_name, scad_name], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except Exception:
+            return False
+        # the STL exists now; failing to cache it is not an error
+        try:
+            os.makedirs(STL_CACHE_DIR, exist_ok=True)
+            tmp = f"{cache_stl}.{os.getpid()}.{threading.get_ident()}"
+            shutil.copyfile(stl_name, tmp)
+            os.replace(tmp, cache_stl)  # atomic, so parallel exports never see a partial file
+        except OSError:
+            pass
+        return True
+
+    # STL straight from Python when trimesh (+ shapely, manifold3d) is installed:
+    # the same extrusion minus hole cylinders that build_scad describes, without
+    # starting openscad or its CGAL CSG. Returns False when the libraries are
+    # missing or the part can't be meshed here, and openscad is used instead.
+    def _mesh_stl(params, stl_name):
+        try:
+            import trimesh
+            from shapely.geometry import Point, Polygon
+        except ImportError:
+            return False
+
+        ptype = params['part_type']
+        thickness = float(params.get('thickness', 5))
+        try:
+            if ptype in ('arm','trapezoid'):
+                L = float(params['length']); wL = float(params['width_left']); wR = float(params['width_right'])
+                outline = Polygon([(0,0),(L,0),(L,wR),(0,wL)])
+            elif ptype == 'rectangle':
+                L = float(params['length']); W = float(params['rect_width'])
+                outline = Polygon([(0,0),(L,0),(L,W),(0,W)])
+            elif ptype == 'circle':
+                # 4 * 32 = 128 segments, as in build_scad; positional, since the
+                # keyword is quad_segs in shapely 2 but quadsegs in 1.x
+                outline = Point(0, 0).buffer(float(params['circle_diameter'])/2.0, 32)
+            else:
+                return False
+
+            mesh = trimesh.creation.extrude_polygon(outline, height=thickness)
+            if int(params.get('hole_count',0)) > 0:
+                hole_r = float(params.get('hole_diameter',6))/2.0
+                xs, ys = _hole_positions(params)
+                # trimesh cylinders are centred on z=0: shift to span -1 .. thickness+1 like the SCAD holes
+                holes = [trimesh.creation.cylinder(radius=hole_r, height=thickness + 2, sections=96)
+                         .apply_translation([x, y, thickness / 2]) for x, y in zip(xs.tolist(), ys.tolist())]
+                if holes:
+                    mesh = trimesh.boolean.difference([mesh] + holes, engine='manifold')
+            # holes that swallow the whole part leave nothing worth writing
+            if mesh.is_empty:
+                return False
+            mesh.export(stl_name)
+            return True
+        except Exception:
+            return False
+
+    # Export any list of .scad files to STL in parallel; stl_paths defaults to
+    # the same names with a .stl extension. Returns each STL path, or "" if it failed.
+    def render_batch(scad_paths, stl_paths=None):
+        scad_paths = list(scad_paths)
+        if stl_paths is None:
+            stl_paths = [os.path.splitext(s)[0] + ".stl" for s in scad_paths]
+        if len(scad_paths) > 1:
+            # openscad runs out of process, so threads are enough to overlap them
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+                created = list(pool.map(_export_stl, scad_paths, stl_paths))
         else:
-            df = df_new
-        df.to_csv(CSV_FILE, index=False)
+            created = list(map(_export_stl, scad_paths, stl_paths))
+        return [stl if ok else "" for stl, ok in zip(stl_paths, created)]
+
+    def flush_scad_queue():
+        with _QUEUE_LOCK:
+            jobs, _SCAD_QUEUE[:] = _SCAD_QUEUE[:], []
+        # rows whose STL was already meshed in Python skip openscad
+        pending = [(row, stl_name) for row, stl_name in jobs if not row["stl"]]
+        stls = render_batch([row["scad"] for row, _ in pending], [stl_name for _, stl_name in pending])
+        for (row, _), stl in zip(pending, stls):
+            row["stl"] = stl
+        # rows are logged here, in order, once we know whether the STL exists
+        for row, _ in jobs:
+            append_csv(row)
+        return [row for row, _ in jobs]
 
     # ---------- Main runner ----------
-    def run_from_prompt(prompt, save_prefix="part"):
+    def run_from_prompt(prompt, save_prefix="part", show=False, flush=True, preview=True, fast_preview=False):
+        from solid import scad_render_to_file
+
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        params = parse_prompt(prompt)
+        # copy: the cached params are read-only and we fill in defaults below
+        params = dict(parse_prompt(prompt))
+        ptype = params['part_type']
         # fill some safe defaults & normalize names used by functions
-        if params['part_type'] in ('arm','trapezoid'):
+        if ptype in ('arm','trapezoid'):
             params.setdefault('length', 150)
             params.setdefault('width_left', 50)
             params.setdefault('width_right', int(params.get('width_left',50)*0.5))
-        elif params['part_type'] == 'rectangle':
+        elif ptype == 'rectangle':
             params.setdefault('length', 120); params.setdefault('rect_width', 40)
-        elif params['part_type'] == 'circle':
+        elif ptype == 'circle':
             params.setdefault('circle_diameter', 80)
 
-        png_name = f"{save_prefix}_{timestamp}.png"
-        scad_name = f"{save_prefix}_{timestamp}.scad"
-
-        # 2D preview
-        generate_2d_preview(params, png_name)
+        # absolute output paths, resolved once (abspath keeps an absolute prefix as-is)
+        base = os.path.abspath(f"{save_prefix}_{timestamp}")
+        png_name = base + ".png" if preview else ""
+        scad_name = base + ".scad"
+
+        # 2D preview; preview=False skips matplotlib entirely (headless / batch runs),
+        # fast_preview=True draws it with Pillow instead
+        preview_img = None
+        if preview:
+            if fast_preview:
+                preview_img = _fast_preview(params, png_name)
+            else:
+                preview_img = generate_2d_preview(params, png_name)
 
         # create SCAD
         part = build_scad(params)
         scad_render_to_file(part, scad_name, file_header='$fn = 96;')
-        # Try to auto-export STL using openscad if available
-        stl_name = scad_name.replace('.scad', '.stl')
-        try:
-            subprocess.run(["openscad", "-o", stl_name, scad_name], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            stl_created = True
-        except Exception:
-            stl_created = False
+        # STL is meshed with trimesh if available, otherwise exported with
+        # openscad (if available) when the queue is flushed
+        stl_name = base + ".stl"
+        stl_ok = _mesh_stl(params, stl_name)
 
         # quick area/weight estimate (same as earlier approximations)
         # This is funtion we r going to use to calculate weight and the density of the generated tool 
 
-        if params['part_type'] in ('arm','trapezoid'):
-            net_area_mm2 = 0.5 * (params['width_left'] + params['width_right']) * params['length']
-        elif params['part_type'] == 'rectangle':
-            net_area_mm2 = params['length'] * params['rect_width']
-        else:
-            net_area_mm2 = math.pi * (params['circle_diameter']/2.0)**2
-
         thickness = params.get('thickness', 5)
-        volume_cm3 = (net_area_mm2 * thickness) / 1000.0
-        density = 2.7 if params.get('material','aluminum')=='aluminum' else 7.85
-        weight_g = volume_cm3 * density
-        yield_strength = 150 if params.get('material','aluminum')=='aluminum' else 250
-        max_force = yield_strength * net_area_mm2
+        material = params.get('material', 'aluminum')
+        target = params.get('target_force_n', 2000)
+        density = MATERIAL_DENSITY.get(material, 2.7)
+        yield_strength = MATERIAL_YIELD_STRENGTH.get(material, 150)
+        net_area_mm2, volume_cm3, weight_g, max_force, passed = _compute_metrics(
+            _PART_CODES.get(ptype, 2), params.get('length', 0),
+            params.get('width_left', 0), params.get('width_right', 0), params.get('rect_width', 0),
+            params.get('circle_diameter', 0), thickness, density, yield_strength, target)
 
-        status = "PASS" if max_force >= params.get('target_force_n', 2000) else "FAIL"
+        status = "PASS" if passed else "FAIL"
 
         # log
         # This here i have used to generate the file name with the timestamp just to maintain the prof
@@ -293,20 +551,25 @@
         row = {
             "timestamp": timestamp,
             "prompt": prompt,
-            "part_type": params['part_type'],
-            "png": os.path.abspath(png_name),
-            "scad": os.path.abspath(scad_name),
-            "stl": os.path.abspath(stl_name) if stl_created else "",
+            "part_type": ptype,
+            "png": png_name,
+            "scad": scad_name,
+            "stl": stl_name if stl_ok else "",
             "net_area_mm2": net_area_mm2,
             "thickness_mm": thickness,
             "volume_cm3": volume_cm3,
-            "material": params.get('material'),
+            "material": material,
             "weight_g": weight_g,
             "max_force_n": max_force,
-            "target_force_n": params.get('target_force_n'),
+            "target_force_n": target,
             "status": status
         }
-        append_csv(row)
+        # export the STL and log the row now, or leave both queued for
+        # a later flush_scad_queue() when running a batch
+        with _QUEUE_LOCK:
+            _SCAD_QUEUE.append((row, stl_name))
+        if flush:
+            flush_scad_queue()
 
         """
             This will print the details which has been appended to the csv
@@ -316,9 +579,38 @@
         for k,v in row.items():
             print(f"{k}: {v}")
 
-        # show preview
-        img = plt.imread(png_name)
-        plt.figure(figsize=(8,4)); plt.imshow(img); plt.axis('off'); plt.show()
+        # show preview (the Pillow image or the canvas snapshot, no PNG re-read)
+        if show and preview:
+            import matplotlib.pyplot as plt
+            plt.figure(figsize=(8,4)); plt.imshow(np.asarray(preview_img)); plt.axis('off'); plt.show()
+
+    # ---------- Batch runner ----------
+    # Prompts are processed in a process pool. Each worker builds its part with
+    # flush=False and hands the queued (row, stl) jobs back, so the parent runs
+    # the openscad exports together and is the only process writing the CSV.
+    def _batch_job(prompt, save_prefix, preview):
+        with _QUEUE_LOCK:
+            start = len(_SCAD_QUEUE)
+        run_from_prompt(prompt, save_prefix=save_prefix, flush=False, preview=preview)
+        # a forked worker inherits the parent's queue; hand back only this prompt's job
+        with _QUEUE_LOCK:
+            jobs, _SCAD_QUEUE[start:] = _SCAD_QUEUE[start:], []
+        return jobs
+
+    # previews are off by default here: batch runs usually only need the SCAD/STL and the CSV
+    def run_batch(prompts, save_prefix="part", preview=False):
+        # number each prompt: file names only carry a seconds timestamp
+        args = [(p, f"{save_prefix}_{i:03d}", preview) for i, p in enumerate(prompts)]
+        if len(args) > 1:
+            from multiprocessing import Pool
+            with Pool(os.cpu_count()) as pool:
+                results = pool.starmap(_batch_job, args)
+        else:
+            results = [_batch_job(*a) for a in args]
+        with _QUEUE_LOCK:
+            for jobs in results:
+                _SCAD_QUEUE.extend(jobs)
+        return flush_scad_queue()
 
     # ---------- Example usage ----------
     if __name__ == "__main__":
@@ -330,13 +622,19 @@
         for i,p in enumerate(example_prompts,1):
             print(f"{i}. {p}")
         print("0. Enter custom prompt")
+        print("a. Generate all examples")
 
-        choice = input("Enter choice [0-2]: ").strip()
-        if choice == '0':
-            prompt = input("Paste prompt: ").strip()
-        elif choice in ('1','2'):
-            prompt = example_prompts[int(choice)-1]
+        choice = input("Enter choice [0-2, a]: ").strip()
+        if choice == 'a':
+            # every example in one batch: SCADs first, then the STL exports in parallel
+            for row in run_batch(example_prompts, save_prefix="part", preview=True):
+                print(f"{row['part_type']}: {row['scad']} {row['stl'] or '(no STL)'}")
         else:
-            prompt = example_prompts[0]
+            if choice == '0':
+                prompt = input("Paste prompt: ").strip()
+            elif choice in ('1','2'):
+                prompt = example_prompts[int(choice)-1]
+            else:
+                prompt = example_prompts[0]
 
-        run_from_prompt(prompt, save_prefix="part")
+            run_from_prompt(prompt, save_prefix="part", show=True)
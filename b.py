@@ -1,16 +1,18 @@
 import re
+import csv
 import os
 import math
 import datetime
+import hashlib
+import shutil
 import subprocess
+import threading
+from functools import lru_cache
+from types import MappingProxyType
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.patches import Polygon, Circle, Rectangle
-import pandas as pd
 
-# SolidPython imports
-from solid import scad_render_to_file, linear_extrude, difference, union, translate, cylinder, polygon, circle, cube
-from solid.utils import *
+# matplotlib and SolidPython are imported inside the functions that use them,
+# so parsing a prompt doesn't pay their import cost
 
 # Constants for better readability
 MATERIAL_DENSITY = {
@@ -22,8 +24,25 @@ MATERIAL_YIELD_STRENGTH = {
     'steel': 250     # MPa, approx for mild steel
 }
 
+# Precompiled prompt patterns: every numeric field in one scan. Keyword
+# prefixes only look ahead at their number so the dimension alternatives
+# still see it; the leading lookahead lets re skip positions that can't
+# start a match.
+_PAT_FIELDS = re.compile(
+    r'(?=[\dwtds])(?:(?P<hole_diameter>\d+)(?= ?mm ?(?:hole|diameter|dia))'
+    r'|(?P<dims>\d+) ?m*m'
+    r'|width(?: ?[:=]? ?|of ?)(?=(?P<width>\d+))'
+    r'|thickness ?[:=]? ?(?=(?P<thickness>\d+))'
+    r'|diameter ?(?=(?P<circle_diameter>\d+))'
+    r'|(?P<bolt>\d+) ?[- ]?bolt|\b(?P<holes>\d+) ?holes?\b'
+    r'|supports ?(?:up to ?)?(?P<target_force_n>\d+) ?n)'
+)
+_FIELD_KEYS = {'bolt': 'hole_count', 'holes': 'hole_count'}
+
+# Parsing is pure in the prompt string, so results are cached and returned read-only
+@lru_cache(maxsize=256)
 def parse_prompt(prompt: str):
-    p = prompt.lower()
+    p = ' '.join(prompt.lower().split())  # one space between words, so the patterns only allow ' ?'
     params = {
         'part_type': 'trapezoid',
         'length': 120,
@@ -42,29 +61,21 @@ def parse_prompt(prompt: str):
     elif 'rectangle' in p or 'bar' in p: params['part_type'] = 'rectangle'
     elif 'trapezoid' in p or 'bracket' in p: params['part_type'] = 'trapezoid'
 
-    # Dimensions
-    dims = re.findall(r'(\d+)\s*m*m', p)
-    if len(dims) >= 1: params['length'] = int(dims[0])
-    if len(dims) >= 2: params['width'] = int(dims[1])
-    
-    # Check for specific dimension keywords
-    if m := re.search(r'width(?:\s*[:=]?\s*|of\s*)(\d+)', p): params['width'] = int(m.group(1))
-    if m := re.search(r'thickness\s*[:=]?\s*(\d+)', p): params['thickness'] = int(m.group(1))
-    if m := re.search(r'diameter\s*(\d+)', p): params['circle_diameter'] = int(m.group(1))
-
-    # Holes
-    if m := re.search(r'(\d+)\s*[- ]?bolt|\b(\d+)\s*holes?\b', p):
-        nums = [g for g in m.groups() if g is not None]
-        params['hole_count'] = int(nums[0]) if nums else 0
-    if m := re.search(r'(\d+)\s*mm\s*(?:hole|diameter|dia)', p): params['hole_diameter'] = int(m.group(1))
-    
+    # Dimensions, holes and target force in a single pass; keywords keep their first match
+    found, dims = {}, []
+    for m in _PAT_FIELDS.finditer(p):
+        kind = m.lastgroup
+        value = int(m.group(kind))
+        if kind in ('dims', 'hole_diameter'): dims.append(value)
+        if kind != 'dims': found.setdefault(_FIELD_KEYS.get(kind, kind), value)
+    if len(dims) >= 1: params['length'] = dims[0]
+    if len(dims) >= 2: params['width'] = dims[1]
+    params.update(found)
+
     # Material
     if 'steel' in p: params['material'] = 'steel'
     elif 'aluminium' in p or 'aluminum' in p: params['material'] = 'aluminum'
 
-    # Target force
-    if m := re.search(r'supports\s*(?:up to\s*)?(\d+)\s*n', p): params['target_force_n'] = int(m.group(1))
-
     # Normalize dimensions for specific part types
     if params['part_type'] in ('arm', 'trapezoid'):
         params['width_left'] = params['width']
@@ -74,62 +85,143 @@ def parse_prompt(prompt: str):
     elif params['part_type'] == 'circle':
         params['circle_diameter'] = params['length']
 
-    return params
+    return MappingProxyType(params)
+
+# Unit bolt-circle tables (cos, sin) per hole count, cached and read-only
+@lru_cache(maxsize=32)
+def _ring_unit(n):
+    ang = 2 * np.pi * np.arange(n) / n
+    cos_t, sin_t = np.cos(ang), np.sin(ang)
+    cos_t.flags.writeable = sin_t.flags.writeable = False
+    return cos_t, sin_t
+
+def _hole_positions(params):
+    # Hole centres for the preview as NumPy arrays; shapes are drawn centred on the origin
+    ptype, hc = params['part_type'], int(params.get('hole_count', 0))
+    idx = np.arange(hc)
+    if ptype in ('arm', 'trapezoid'):
+        L, wL, wR = params['length'], params['width_left'], params['width_right']
+        xs = (idx + 1) * L / (hc + 1)
+        ys = (wL / 2) - (wL - wR) / 2 * ((idx + 1) / (hc + 1))
+    elif ptype == 'rectangle':
+        L = params['length']
+        xs, ys = (idx + 1) * L / (hc + 1) - L / 2, np.zeros(hc)
+    elif ptype == 'circle' and hc > 0:
+        ring_r = params['circle_diameter'] / 2.0 * 0.5
+        cos_t, sin_t = _ring_unit(hc)
+        xs, ys = ring_r * cos_t, ring_r * sin_t
+    else:
+        xs = ys = np.empty(0)
+    return xs, ys
+
+# One preview figure, rendered straight to an Agg canvas (no pyplot) and cleared per call; the lock keeps threads off each other's drawing
+_PREVIEW_FIG = None
+_PREVIEW_LOCK = threading.Lock()
+
+def _preview_axes():
+    global _PREVIEW_FIG
+    if _PREVIEW_FIG is None:
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        _PREVIEW_FIG = Figure(figsize=(6, 3))
+        FigureCanvasAgg(_PREVIEW_FIG)
+        _PREVIEW_FIG.add_subplot()
+    ax = _PREVIEW_FIG.axes[0]
+    ax.clear()
+    return _PREVIEW_FIG, ax
 
 def generate_2d_preview(params, out_png):
-    fig, ax = plt.subplots(figsize=(6, 3))
-    ptype = params['part_type']
+    from matplotlib.patches import Polygon, Circle, Rectangle
+    from matplotlib.collections import EllipseCollection
+    with _PREVIEW_LOCK:
+        fig, ax = _preview_axes()
+        ptype = params['part_type']
+    
+        # Draw the main part shape
+        if ptype in ('arm', 'trapezoid'):
+            L, wL, wR = params['length'], params['width_left'], params['width_right']
+            pts = np.array([[0, wL/2], [L, wR/2], [L, -wR/2], [0, -wL/2]], dtype=np.float64)
+            ax.add_patch(Polygon(pts, closed=True, facecolor='lightgrey', edgecolor='black'))
+        
+            # Add dimension annotations
+            ax.annotate(f"{L} mm", xy=(L/2, wL/2 + 5), ha='center', va='bottom')
+            ax.annotate(f"{wL} mm", xy=(-5, 0), ha='right', va='center')
+            ax.annotate(f"{wR} mm", xy=(L+5, 0), ha='left', va='center')
+        
+        elif ptype == 'rectangle':
+            L, W = params['length'], params['rect_width']
+            ax.add_patch(Rectangle((-L/2, -W/2), L, W, facecolor='lightgrey', edgecolor='black'))
+            ax.annotate(f"{L} mm", xy=(0, W/2 + 5), ha='center', va='bottom')
+            ax.annotate(f"{W} mm", xy=(-L/2 - 5, 0), ha='right', va='center')
+
+        elif ptype == 'circle':
+            D = params['circle_diameter']; r = D/2.0
+            ax.add_patch(Circle((0,0), radius=r, facecolor='lightgrey', edgecolor='black'))
+            ax.annotate(f"⌀ {D} mm", xy=(0, r+5), ha='center', va='bottom')
     
-    # Draw the main part shape
+        # Draw holes
+        hr = params.get('hole_diameter', 6) / 2.0
+        hole_radius_scale = 1 # for visual clarity
+    
+        xs, ys = _hole_positions(params)
+        if len(xs):
+            d = np.full(len(xs), 2 * hr * hole_radius_scale)
+            ax.add_collection(EllipseCollection(d, d, 0, units='xy', offsets=np.column_stack([xs, ys]),
+                                                offset_transform=ax.transData, facecolor='white', edgecolor='black'),
+                              autolim=False)  # match add_patch, which doesn't rescale the view
+
+        ax.set_aspect('equal')
+        ax.axis('off')
+        fig.savefig(out_png, dpi=100, bbox_inches='tight')
+        return np.array(fig.canvas.buffer_rgba())  # snapshot taken under the lock, for the show path
+
+# Pillow preview: same shapes and labels as generate_2d_preview, rasterised in one pass without matplotlib
+def _fast_preview(params, out_png):
+    from PIL import Image, ImageDraw, ImageFont
+    ptype = params['part_type']
+    labels = []  # (x, y, text, anchor) in world coordinates
     if ptype in ('arm', 'trapezoid'):
         L, wL, wR = params['length'], params['width_left'], params['width_right']
         pts = [(0, wL/2), (L, wR/2), (L, -wR/2), (0, -wL/2)]
-        ax.add_patch(Polygon(pts, closed=True, facecolor='lightgrey', edgecolor='black'))
-        
-        # Add dimension annotations
-        ax.annotate(f"{L} mm", xy=(L/2, wL/2 + 5), ha='center', va='bottom')
-        ax.annotate(f"{wL} mm", xy=(-5, 0), ha='right', va='center')
-        ax.annotate(f"{wR} mm", xy=(L+5, 0), ha='left', va='center')
-        
+        labels = [(L/2, wL/2 + 5, f"{L} mm", 'ms'), (-5, 0, f"{wL} mm", 'rm'), (L+5, 0, f"{wR} mm", 'lm')]
     elif ptype == 'rectangle':
         L, W = params['length'], params['rect_width']
-        ax.add_patch(Rectangle((-L/2, -W/2), L, W, facecolor='lightgrey', edgecolor='black'))
-        ax.annotate(f"{L} mm", xy=(0, W/2 + 5), ha='center', va='bottom')
-        ax.annotate(f"{W} mm", xy=(-L/2 - 5, 0), ha='right', va='center')
-
+        pts = [(-L/2, W/2), (L/2, W/2), (L/2, -W/2), (-L/2, -W/2)]
+        labels = [(0, W/2 + 5, f"{L} mm", 'ms'), (-L/2 - 5, 0, f"{W} mm", 'rm')]
     elif ptype == 'circle':
         D = params['circle_diameter']; r = D/2.0
-        ax.add_patch(Circle((0,0), radius=r, facecolor='lightgrey', edgecolor='black'))
-        ax.annotate(f"⌀ {D} mm", xy=(0, r+5), ha='center', va='bottom')
+        pts = [(-r, r), (r, -r)]
+        labels = [(0, r + 5, f"Dia {D} mm", 'ms')]  # Pillow's default font has no ⌀ glyph
+    else:
+        return generate_2d_preview(params, out_png)
     
-    # Draw holes
-    hc, hr = params.get('hole_count', 0), params.get('hole_diameter', 6) / 2.0
-    hole_radius_scale = 1 # for visual clarity
+    # Fit the part into ~500x200 px and leave a fixed 70 px border for the labels
+    x0, x1 = min(x for x, _ in pts), max(x for x, _ in pts)
+    y0, y1 = min(y for _, y in pts), max(y for _, y in pts)
+    if x1 == x0 or y1 == y0:  # zero-size part: nothing to scale, let matplotlib draw it
+        return generate_2d_preview(params, out_png)
+    s, pad = min(500 / (x1 - x0), 200 / (y1 - y0)), 70
+    px = lambda x, y: (pad + (x - x0) * s, pad + (y1 - y) * s)
+    img = Image.new('RGB', (round((x1 - x0) * s) + 2 * pad, round((y1 - y0) * s) + 2 * pad), 'white')
+    draw = ImageDraw.Draw(img)
+    if ptype == 'circle':
+        draw.ellipse([*px(-r, r), *px(r, -r)], fill='lightgrey', outline='black')
+    else:
+        draw.polygon([px(x, y) for x, y in pts], fill='lightgrey', outline='black')
     
-    if hc > 0:
-        if ptype in ('arm', 'trapezoid'):
-            for i in range(hc):
-                x = (i+1) * L / (hc+1)
-                y_pos = (params['width_left']/2) - (params['width_left']-params['width_right'])/2 * ((i+1)/(hc+1))
-                ax.add_patch(Circle((x, y_pos), radius=hr * hole_radius_scale, facecolor='white', edgecolor='black'))
-        elif ptype == 'rectangle':
-            for i in range(hc):
-                x = (i+1) * L / (hc+1) - L/2
-                y = 0
-                ax.add_patch(Circle((x, y), radius=hr * hole_radius_scale, facecolor='white', edgecolor='black'))
-        elif ptype == 'circle':
-            ring_r = r * 0.5
-            for i in range(hc):
-                ang = 2 * math.pi * i / hc
-                x, y = ring_r * math.cos(ang), ring_r * math.sin(ang)
-                ax.add_patch(Circle((x,y), radius=hr * hole_radius_scale, facecolor='white', edgecolor='black'))
-
-    ax.set_aspect('equal')
-    ax.axis('off')
-    plt.savefig(out_png, dpi=200, bbox_inches='tight')
-    plt.close(fig)
+    xs, ys = _hole_positions(params)
+    hr = params.get('hole_diameter', 6) / 2.0 * s
+    for cx, cy in zip((pad + (xs - x0) * s).tolist(), (pad + (y1 - ys) * s).tolist()):
+        draw.ellipse([cx - hr, cy - hr, cx + hr, cy + hr], fill='white', outline='black')
+    
+    font = ImageFont.load_default(12)
+    for x, y, text, anchor in labels:
+        draw.text(px(x, y), text, fill='black', font=font, anchor=anchor)
+    img.save(out_png, optimize=False)
+    return img
 
-def build_scad(params):
+def _build_scad(params):
+    from solid import linear_extrude, difference, union, translate, polygon, circle, cube
     ptype = params['part_type']
     thickness = float(params.get('thickness', 5))
     solid_base = None  # Initialize solid_base to a default value
@@ -152,10 +244,9 @@ def build_scad(params):
     # --- Add this new block to handle the 'l_bracket' part type ---
     elif ptype == 'l_bracket':
         # Define the two parts of the L-bracket and union them
-        part1 = cube([params.get('width', 40), params.get('length', 120), thickness])
-        part2 = translate([0, params.get('length', 120) - thickness, 0])(
-            cube([params.get('width', 40), thickness, params.get('length', 120) / 2])
-        )
+        W, L = params.get('width', 40), params.get('length', 120)
+        part1 = cube([W, L, thickness])
+        part2 = translate([0, L - thickness, 0])(cube([W, thickness, L / 2]))
         solid_base = union()(part1, part2)
     # --- End of new block ---
 
@@ -180,77 +271,206 @@ def build_scad(params):
 
     return part
 
+# SolidPython trees for parts already built, keyed on every field _build_scad reads (oldest dropped when full)
+_SCAD_CACHE = {}
+_SCAD_CACHE_SIZE = 128
+
+def build_scad(params):
+    key = (params['part_type'], params.get('thickness', 5), params.get('length'), params.get('width'),
+           params.get('width_left'), params.get('width_right'), params.get('rect_width'),
+           params.get('circle_diameter'), params.get('hole_count', 0), params.get('hole_diameter', 6))
+    part = _SCAD_CACHE.get(key)
+    if part is None:
+        part = _build_scad(params)
+        if len(_SCAD_CACHE) >= _SCAD_CACHE_SIZE:
+            del _SCAD_CACHE[next(iter(_SCAD_CACHE))]
+        _SCAD_CACHE[key] = part
+    return part
+
+# Fixed log schema; rows are appended, so they must line up with the header written on creation
+CSV_FIELDS = ("timestamp", "prompt", "part_type", "png", "scad", "stl", "net_area_mm2", "thickness_mm",
+              "volume_cm3", "material", "weight_g", "max_force_n", "target_force_n", "status")
+
 def append_csv(row_dict):
     CSV_FILE = "parts_generated.csv"
-    df_new = pd.DataFrame([row_dict])
-    if os.path.exists(CSV_FILE):
-        df = pd.read_csv(CSV_FILE)
-        df = pd.concat([df, df_new], ignore_index=True)
+    write_header = not os.path.exists(CSV_FILE)
+    with open(CSV_FILE, 'a', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        if write_header:
+            writer.writeheader()
+        writer.writerow(row_dict)
+
+# Part-type codes for _compute_metrics: 0 = arm/trapezoid, 1 = rectangle, 2 = circle, 3 = other
+_PART_CODES = {'arm': 0, 'trapezoid': 0, 'rectangle': 1, 'circle': 2}
+
+def _compute_metrics(part_code, L, wL, wR, rw, D, effective_width, thickness, density, yield_s, target):
+    # Weight and strength from plain scalars, no dict lookups
+    net_area_mm2 = 0
+    if part_code == 0: net_area_mm2 = 0.5 * (wL + wR) * L
+    elif part_code == 1: net_area_mm2 = L * rw
+    elif part_code == 2: net_area_mm2 = math.pi * (D/2.0)**2
+    volume_cm3 = (net_area_mm2 * thickness) / 1000.0
+    weight_g = volume_cm3 * density
+    # Simple stress calculation (Force / Area), assuming cross-section is thickness * min_width
+    max_force = effective_width * thickness * (yield_s / 1000) # Convert MPa to N/mm^2
+    return net_area_mm2, volume_cm3, weight_g, max_force, max_force >= target
+
+# STL exports queued as (csv row, stl path); flush_scad_queue() runs openscad for all of them in parallel
+_SCAD_QUEUE = []
+_QUEUE_LOCK = threading.Lock()
+
+# openscad output cached by a hash of the SCAD text (minus the timestamped header line)
+STL_CACHE_DIR = ".scad_cache"
+
+def _export_stl(scad_name, stl_name):
+    try:
+        with open(scad_name, 'rb') as f:
+            text = f.read()
+        if text.startswith(b'//'):
+            text = text.partition(b'\n')[2]
+        cache_stl = os.path.join(STL_CACHE_DIR, hashlib.blake2b(text, digest_size=8).hexdigest() + ".stl")
+        if os.path.exists(cache_stl):
+            shutil.copyfile(cache_stl, stl_name)
+            return True
+        subprocess.run(["openscad", "-o", stl_name, scad_name], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except Exception:
+        return False
+    try:
+        os.makedirs(STL_CACHE_DIR, exist_ok=True)
+        tmp = f"{cache_stl}.{os.getpid()}.{threading.get_ident()}"
+        shutil.copyfile(stl_name, tmp)
+        os.replace(tmp, cache_stl)
+    except OSError:
+        pass
+    return True
+
+# STL straight from Python when trimesh (+ shapely, manifold3d) is installed; False means fall back to openscad
+def _mesh_stl(params, stl_name):
+    try:
+        import trimesh
+        from shapely.geometry import Point, Polygon
+    except ImportError:
+        return False
+    ptype, thickness = params['part_type'], float(params.get('thickness', 5))
+    try:
+        if ptype in ('arm', 'trapezoid'):
+            L, wL, wR = float(params['length']), float(params['width_left']), float(params['width_right'])
+            mesh = trimesh.creation.extrude_polygon(Polygon([(0,0), (L,0), (L,wR), (0,wL)]), height=thickness)
+        elif ptype == 'rectangle':
+            L, W = float(params['length']), float(params['rect_width'])
+            mesh = trimesh.creation.extrude_polygon(Polygon([(0,0), (L,0), (L,W), (0,W)]), height=thickness)
+        elif ptype == 'circle':
+            r = float(params['circle_diameter']) / 2.0
+            mesh = trimesh.creation.extrude_polygon(Point(0, 0).buffer(r, 32), height=thickness)  # 128 segments
+        else:
+            return False
+        if mesh.is_empty:
+            return False
+        mesh.export(stl_name)
+        return True
+    except Exception:
+        return False
+
+# Export .scad files to STL in parallel; returns each STL path, or "" where openscad failed
+def render_batch(scad_paths, stl_paths=None):
+    scad_paths = list(scad_paths)
+    if stl_paths is None:
+        stl_paths = [os.path.splitext(s)[0] + ".stl" for s in scad_paths]
+    if len(scad_paths) > 1:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+            created = list(pool.map(_export_stl, scad_paths, stl_paths))
     else:
-        df = df_new
-    df.to_csv(CSV_FILE, index=False)
+        created = list(map(_export_stl, scad_paths, stl_paths))
+    return [stl if ok else "" for stl, ok in zip(stl_paths, created)]
 
-def run_from_prompt(prompt, save_prefix="part"):
+def flush_scad_queue():
+    with _QUEUE_LOCK:
+        jobs, _SCAD_QUEUE[:] = _SCAD_QUEUE[:], []
+    pending = [(row, stl_name) for row, stl_name in jobs if not row["stl"]]  # already meshed rows skip openscad
+    stls = render_batch([row["scad"] for row, _ in pending], [stl_name for _, stl_name in pending])
+    for (row, _), stl in zip(pending, stls):
+        row["stl"] = stl
+    for row, _ in jobs:
+        append_csv(row)
+    return [row for row, _ in jobs]
+
+def run_from_prompt(prompt, save_prefix="part", show=False, flush=True, preview=True, fast_preview=False):
+    from solid import scad_render_to_file
     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
     params = parse_prompt(prompt)
     
-    png_name, scad_name = f"{save_prefix}_{timestamp}.png", f"{save_prefix}_{timestamp}.scad"
-    generate_2d_preview(params, png_name)
+    base = os.path.abspath(f"{save_prefix}_{timestamp}")
+    png_name, scad_name = (base + ".png" if preview else ""), base + ".scad"
+    preview_img = None
+    if preview:  # skip matplotlib entirely for headless / batch runs; fast_preview draws it with Pillow
+        preview_img = _fast_preview(params, png_name) if fast_preview else generate_2d_preview(params, png_name)
     
     part = build_scad(params)
     scad_render_to_file(part, scad_name, file_header='$fn = 96;')
     
-    stl_name = scad_name.replace('.scad', '.stl')
-    stl_created = False
-    try:
-        subprocess.run(["openscad", "-o", stl_name, scad_name], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        stl_created = True
-    except Exception:
-        pass
+    stl_name = base + ".stl"
+    stl_ok = _mesh_stl(params, stl_name)
     
     # Weight and strength calculation
-    net_area_mm2 = 0
-    if params['part_type'] in ('arm', 'trapezoid'):
-        net_area_mm2 = 0.5 * (params['width_left'] + params['width_right']) * params['length']
-    elif params['part_type'] == 'rectangle':
-        net_area_mm2 = params['length'] * params['rect_width']
-    elif params['part_type'] == 'circle':
-        net_area_mm2 = math.pi * (params['circle_diameter']/2.0)**2
-    
+    ptype, material, target = params['part_type'], params.get('material'), params.get('target_force_n', 2000)
     thickness = params.get('thickness', 5)
-    volume_cm3 = (net_area_mm2 * thickness) / 1000.0
-    density = MATERIAL_DENSITY.get(params.get('material'), 2.7)
-    weight_g = volume_cm3 * density
-    
-    yield_strength = MATERIAL_YIELD_STRENGTH.get(params.get('material'), 150)
-    # Simple stress calculation (Force / Area), assuming cross-section is thickness * min_width
+    density = MATERIAL_DENSITY.get(material, 2.7)
+    yield_strength = MATERIAL_YIELD_STRENGTH.get(material, 150)
     effective_width = params.get('width_right', params.get('rect_width', params.get('circle_diameter')))
-    min_cross_area_mm2 = effective_width * thickness
-    
-    max_force = min_cross_area_mm2 * (yield_strength / 1000) # Convert MPa to N/mm^2
-    status = "PASS" if max_force >= params.get('target_force_n', 2000) else "FAIL"
+    net_area_mm2, volume_cm3, weight_g, max_force, passed = _compute_metrics(
+        _PART_CODES.get(ptype, 3), params['length'], params.get('width_left', 0),
+        params.get('width_right', 0), params.get('rect_width', 0), params.get('circle_diameter', 0),
+        effective_width, thickness, density, yield_strength, target)
+    status = "PASS" if passed else "FAIL"
     
     # Log to CSV
     row = {
-        "timestamp": timestamp, "prompt": prompt, "part_type": params['part_type'], "png": os.path.abspath(png_name),
-        "scad": os.path.abspath(scad_name), "stl": os.path.abspath(stl_name) if stl_created else "",
+        "timestamp": timestamp, "prompt": prompt, "part_type": ptype, "png": png_name,
+        "scad": scad_name, "stl": stl_name if stl_ok else "",
         "net_area_mm2": net_area_mm2, "thickness_mm": thickness, "volume_cm3": volume_cm3,
-        "material": params.get('material'), "weight_g": weight_g, "max_force_n": max_force,
-        "target_force_n": params.get('target_force_n'), "status": status
+        "material": material, "weight_g": weight_g, "max_force_n": max_force,
+        "target_force_n": target, "status": status
     }
-    append_csv(row)
+    with _QUEUE_LOCK:
+        _SCAD_QUEUE.append((row, stl_name))
+    if flush:
+        flush_scad_queue()
     
     # Display results
     print("=== Generated Summary ===")
     print(f"**Prompt:** {prompt}")
-    print(f"**Part Type:** {params['part_type']}")
-    print(f"**Material:** {params['material']}")
+    print(f"**Part Type:** {ptype}")
+    print(f"**Material:** {material}")
     print(f"**Weight:** {weight_g:.2f} g")
-    print(f"**Load Capacity:** {max_force:.2f} N (Target: {params.get('target_force_n', 2000)} N)")
+    print(f"**Load Capacity:** {max_force:.2f} N (Target: {target} N)")
     print(f"**Status:** {'✅ PASS' if status == 'PASS' else '⚠️ FAIL'}")
     
-    img = plt.imread(png_name)
-    plt.figure(figsize=(8,4)); plt.imshow(img); plt.axis('off'); plt.title(f"2D Preview: {params['part_type']}"); plt.show()
+    if show and preview:
+        import matplotlib.pyplot as plt
+        plt.figure(figsize=(8,4)); plt.imshow(np.asarray(preview_img)); plt.axis('off'); plt.title(f"2D Preview: {ptype}"); plt.show()
+
+# Batch mode: workers build parts with flush=False and return their queued jobs, so only this process writes the CSV
+def _batch_job(prompt, save_prefix, preview):
+    with _QUEUE_LOCK:
+        start = len(_SCAD_QUEUE)
+    run_from_prompt(prompt, save_prefix=save_prefix, flush=False, preview=preview)
+    with _QUEUE_LOCK:
+        jobs, _SCAD_QUEUE[start:] = _SCAD_QUEUE[start:], []
+    return jobs
+
+def run_batch(prompts, save_prefix="part", preview=False):  # previews off by default for batch runs
+    args = [(p, f"{save_prefix}_{i:03d}", preview) for i, p in enumerate(prompts)]  # numbered: timestamps are per second
+    if len(args) > 1:
+        from multiprocessing import Pool
+        with Pool(os.cpu_count()) as pool:
+            results = pool.starmap(_batch_job, args)
+    else:
+        results = [_batch_job(*a) for a in args]
+    with _QUEUE_LOCK:
+        for jobs in results:
+            _SCAD_QUEUE.extend(jobs)
+    return flush_scad_queue()
 
 if __name__ == "__main__":
     example_prompts = [
@@ -262,13 +482,18 @@ if __name__ == "__main__":
     for i,p in enumerate(example_prompts,1):
         print(f"{i}. {p}")
     print("0. Enter custom prompt")
+    print("a. Generate all examples")
     
-    choice = input("Enter choice [0-3]: ").strip()
-    if choice == '0':
-        prompt = input("Paste prompt: ").strip()
-    elif choice in ('1','2','3'):
-        prompt = example_prompts[int(choice)-1]
+    choice = input("Enter choice [0-3, a]: ").strip()
+    if choice == 'a':
+        for row in run_batch(example_prompts, save_prefix="part", preview=True):
+            print(f"{row['part_type']}: {row['scad']} {row['stl'] or '(no STL)'}")
     else:
-        prompt = example_prompts[0]
-    
-    run_from_prompt(prompt, save_prefix="part")
\ No newline at end of file
+        if choice == '0':
+            prompt = input("Paste prompt: ").strip()
+        elif choice in ('1','2','3'):
+            prompt = example_prompts[int(choice)-1]
+        else:
+            prompt = example_prompts[0]
+        
+        run_from_prompt(prompt, save_prefix="part", show=True)
\ No newline at end of file
@@ -1,68 +1,78 @@
 import re
+import csv
 import os
 import math
 import datetime
+import hashlib
+import shutil
 import subprocess
+import threading
+from functools import lru_cache
+from types import MappingProxyType
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.patches import Polygon, Circle, Rectangle
-import pandas as pd
-from solid import scad_render_to_file, linear_extrude, difference, union, translate, cylinder, polygon, circle, cube
-from solid import *
-from solid.utils import *
 
+MATERIAL_DENSITY = {'aluminum': 2.7, 'steel': 7.85}
+MATERIAL_YIELD_STRENGTH = {'aluminum': 150, 'steel': 250}
+
+_PAT_KEYWORDS = re.compile(
+    r'(?=[ablprst])(?:(?P<arm>\barm\b)'
+    r'|(?P<l_bracket>\bl-?bracket\b|\bl bracket\b)'
+    r'|(?P<circle>\bplate\b)'
+    r'|(?P<rectangle>\brectangl|bar\b)'
+    r'|(?P<trapezoid>\btrapezoid\b|\bbracket\b)'
+    r'|(?P<steel>steel)'
+    r'|(?P<aluminum>alumini?um))'
+)
+_PART_TYPE_PRIORITY = ('arm', 'l_bracket', 'circle', 'rectangle', 'trapezoid')
+_MATERIAL_PRIORITY = ('steel', 'aluminum')
+_PAT_FIELDS = re.compile(
+    r'(?=[\dwts])(?:(?P<dia>\d+)(?= ?mm ?(?:hole|diameter|dia))'
+    r'|(?P<mm>\d+) ?mm'
+    r'|width(?: ?[:=]? ?|of ?)(?=(?P<width>\d+) ?mm)'
+    r'|thickness ?[:=]? ?(?=(?P<thickness>\d+) ?mm)'
+    r'|(?P<bolt>\d+) ?[- ]?bolt|\b(?P<holes>\d+) ?holes?\b'
+    r'|supports ?(?:up to ?)?(?P<force>\d+) ?n)'
+)
+_FIELD_KEYS = {
+    'dia': 'hole_diameter',
+    'width': 'width',
+    'thickness': 'thickness',
+    'bolt': 'hole_count',
+    'holes': 'hole_count',
+    'force': 'target_force_n',
+}
+_PAT_LENGTH_WORD = re.compile(r'(\d+) ?(?:long|length|l\b)')
+
+@lru_cache(maxsize=256)
 def parse_prompt(prompt: str):
-    p = prompt.lower()
+    p = ' '.join(prompt.lower().split())
     params = {}
-    if re.search(r'\barm\b', p):
-        params['part_type'] = 'arm'
-    elif re.search(r'\bl-?bracket\b|\bl bracket\b', p):
-        params['part_type'] = 'l_bracket'
-    elif re.search(r'\bplate\b', p):
-        params['part_type'] = 'circle'
-    elif re.search(r'\brectangl|bar\b', p):
-        params['part_type'] = 'rectangle'
-    elif re.search(r'\btrapezoid\b|\bbracket\b', p):
-        params['part_type'] = 'trapezoid'
-    else:
-        params['part_type'] = 'trapezoid'
-    m = re.search(r'(\d+)\s*mm', p)
-    if m:
-        params['length'] = int(m.group(1))
-    else:
-        m2 = re.search(r'(\d+)\s*(?:long|length|l\b)', p)
-        params['length'] = int(m2.group(1)) if m2 else 120
-    m = re.search(r'width(?:\s*[:=]?\s*|of\s*)(\d+)\s*mm', p)
-    if m:
-        params['width'] = int(m.group(1))
-    else:
-        mm_all = re.findall(r'(\d+)\s*mm', p)
-        if len(mm_all) >= 2:
-            params['width'] = int(mm_all[1])
-        else:
-            params['width'] = 40
-    m = re.search(r'thickness\s*[:=]?\s*(\d+)\s*mm', p)
-    if m:
-        params['thickness'] = int(m.group(1))
-    else:
-        params['thickness'] = 5
-    m = re.search(r'(\d+)\s*[- ]?bolt|\b(\d+)\s*holes?\b', p)
-    if m:
-        nums = [g for g in m.groups() if g is not None]
-        params['hole_count'] = int(nums[0]) if nums else 0
+    keywords = {m.lastgroup for m in _PAT_KEYWORDS.finditer(p)}
+    params['part_type'] = next((t for t in _PART_TYPE_PRIORITY if t in keywords), 'trapezoid')
+    found = {}
+    mm_values = []
+    for m in _PAT_FIELDS.finditer(p):
+        kind = m.lastgroup
+        value = int(m.group(kind))
+        if kind in ('mm', 'dia'):
+            mm_values.append(value)
+        key = _FIELD_KEYS.get(kind)
+        if key is not None:
+            found.setdefault(key, value)
+    if mm_values:
+        params['length'] = mm_values[0]
     else:
-        m2 = re.search(r'(\d+)-bolt', p)
-        params['hole_count'] = int(m2.group(1)) if m2 else 3
-    m = re.search(r'(\d+)\s*mm\s*(?:hole|diameter|dia)', p)
-    params['hole_diameter'] = int(m.group(1)) if m else 6
-    if 'steel' in p:
-        params['material'] = 'steel'
-    elif 'aluminium' in p or 'aluminum' in p:
-        params['material'] = 'aluminum'
+        m = _PAT_LENGTH_WORD.search(p)
+        params['length'] = int(m.group(1)) if m else 120
+    if 'width' in found:
+        params['width'] = found['width']
     else:
-        params['material'] = 'aluminum'
-    m = re.search(r'supports\s*(?:up to\s*)?(\d+)\s*n', p)
-    params['target_force_n'] = int(m.group(1)) if m else 2000
+        params['width'] = mm_values[1] if len(mm_values) >= 2 else 40
+    params['thickness'] = found.get('thickness', 5)
+    params['hole_count'] = found.get('hole_count', 3)
+    params['hole_diameter'] = found.get('hole_diameter', 6)
+    params['material'] = next((t for t in _MATERIAL_PRIORITY if t in keywords), 'aluminum')
+    params['target_force_n'] = found.get('target_force_n', 2000)
     if params['part_type'] == 'arm' or params['part_type'] == 'trapezoid':
         params['length'] = params.get('length', 150)
         params['width_left'] = params.get('width', 50)
@@ -72,47 +82,113 @@ def parse_prompt(prompt: str):
         params['rect_height'] = params.get('thickness', 5)
     elif params['part_type'] == 'circle':
         params['circle_diameter'] = params.get('length', 80)
-    for k,v in list(params.items()):
-        if isinstance(v, str) and v.isdigit():
-            params[k] = int(v)
-    return params
+    return MappingProxyType(params)
+
+@lru_cache(maxsize=32)
+def _ring_unit(n):
+    ang = 2 * np.pi * np.arange(n) / n
+    cos_t, sin_t = np.cos(ang), np.sin(ang)
+    cos_t.flags.writeable = sin_t.flags.writeable = False
+    return cos_t, sin_t
+
+def _hole_positions(params):
+    ptype = params['part_type']
+    hc = int(params.get('hole_count', 0))
+    idx = np.arange(hc)
+    if ptype in ('arm','trapezoid'):
+        xs = (idx + 1) * params['length'] / (hc + 1)
+        ys = np.full(hc, (params['width_left'] + params['width_right']) / 4.0)
+    elif ptype == 'rectangle':
+        xs = (idx + 1) * params['length'] / (hc + 1)
+        ys = np.full(hc, params['rect_width'] / 2.0)
+    elif ptype == 'circle' and hc > 0:
+        ring_r = params['circle_diameter'] / 2.0 * 0.5
+        cos_t, sin_t = _ring_unit(hc)
+        xs = ring_r * cos_t; ys = ring_r * sin_t
+    else:
+        xs = ys = np.empty(0)
+    return xs, ys
+
+_PREVIEW_FIG = None
+_PREVIEW_LOCK = threading.Lock()
+
+def _preview_axes():
+    global _PREVIEW_FIG
+    if _PREVIEW_FIG is None:
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        _PREVIEW_FIG = Figure(figsize=(6,3))
+        FigureCanvasAgg(_PREVIEW_FIG)
+        _PREVIEW_FIG.add_subplot()
+    ax = _PREVIEW_FIG.axes[0]
+    ax.clear()
+    return _PREVIEW_FIG, ax
 
 def generate_2d_preview(params, out_png):
-    fig, ax = plt.subplots(figsize=(6,3))
+    from matplotlib.patches import Polygon, Circle, Rectangle
+    from matplotlib.collections import EllipseCollection
+    with _PREVIEW_LOCK:
+        fig, ax = _preview_axes()
+        ptype = params['part_type']
+        if ptype in ('arm','trapezoid'):
+            L = params['length']; wL = params['width_left']; wR = params['width_right']
+            pts = np.array([[0, 0], [L, 0], [L, wR], [0, wL]], dtype=np.float64)
+            ax.add_patch(Polygon(pts, closed=True, facecolor='lightgrey', edgecolor='black'))
+            ax.set_xlim(-10, L+10); ax.set_ylim(-10, max(wL,wR)+10)
+        elif ptype == 'rectangle':
+            L = params['length']; W = params['rect_width']
+            ax.add_patch(Rectangle((0,0), L, W, facecolor='lightgrey', edgecolor='black'))
+            ax.set_xlim(-10, L+10); ax.set_ylim(-10, W+10)
+        elif ptype == 'circle':
+            D = params['circle_diameter']; r = D/2.0
+            ax.add_patch(Circle((0,0), radius=r, facecolor='lightgrey', edgecolor='black'))
+            ax.set_xlim(-r-10, r+10); ax.set_ylim(-r-10, r+10)
+        xs, ys = _hole_positions(params)
+        if len(xs):
+            d = np.full(len(xs), float(params.get('hole_diameter', 6)))
+            ax.add_collection(EllipseCollection(d, d, 0, units='xy', offsets=np.column_stack([xs, ys]),
+                                                offset_transform=ax.transData, facecolor='white', edgecolor='black'))
+        ax.set_aspect('equal'); ax.axis('off')
+        ax.apply_aspect()
+        crop = ax.get_position().transformed(fig.transFigure - fig.dpi_scale_trans).padded(0.1)
+        fig.savefig(out_png, dpi=100, bbox_inches=crop)
+        return np.array(fig.canvas.buffer_rgba())
+
+def _fast_preview(params, out_png):
+    from PIL import Image, ImageDraw
     ptype = params['part_type']
     if ptype in ('arm','trapezoid'):
         L = params['length']; wL = params['width_left']; wR = params['width_right']
         pts = [(0, 0), (L, 0), (L, wR), (0, wL)]
-        ax.add_patch(Polygon(pts, closed=True, facecolor='lightgrey', edgecolor='black'))
-        hc = params.get('hole_count', 0); hr = params.get('hole_diameter',6)/2.0
-        for i in range(hc):
-            x = (i+1) * L / (hc+1)
-            y = (wL + wR) / 4.0
-            ax.add_patch(Circle((x, y), radius=hr, facecolor='white', edgecolor='black'))
-        ax.set_xlim(-10, L+10); ax.set_ylim(-10, max(wL,wR)+10)
+        x0, x1, y0, y1 = -10, L+10, -10, max(wL,wR)+10
     elif ptype == 'rectangle':
         L = params['length']; W = params['rect_width']
-        ax.add_patch(Rectangle((0,0), L, W, facecolor='lightgrey', edgecolor='black'))
-        hc = params.get('hole_count', 0); hr = params.get('hole_diameter',6)/2.0
-        for i in range(hc):
-            x = (i+1) * L / (hc+1); y = W/2.0
-            ax.add_patch(Circle((x,y), radius=hr, facecolor='white', edgecolor='black'))
-        ax.set_xlim(-10, L+10); ax.set_ylim(-10, W+10)
+        pts = [(0, 0), (L, 0), (L, W), (0, W)]
+        x0, x1, y0, y1 = -10, L+10, -10, W+10
     elif ptype == 'circle':
-        D = params['circle_diameter']; r = D/2.0
-        ax.add_patch(Circle((0,0), radius=r, facecolor='lightgrey', edgecolor='black'))
-        hc = params.get('hole_count', 0); hr = params.get('hole_diameter',6)/2.0
-        if hc>0:
-            ring_r = r*0.5
-            for i in range(hc):
-                ang = 2*math.pi*i/hc
-                x = ring_r*math.cos(ang); y = ring_r*math.sin(ang)
-                ax.add_patch(Circle((x,y), radius=hr, facecolor='white', edgecolor='black'))
-        ax.set_xlim(-r-10, r+10); ax.set_ylim(-r-10, r+10)
-    ax.set_aspect('equal'); ax.axis('off')
-    plt.savefig(out_png, dpi=200, bbox_inches='tight'); plt.close(fig)
+        r = params['circle_diameter']/2.0
+        pts = None
+        x0, x1, y0, y1 = -r-10, r+10, -r-10, r+10
+    else:
+        return generate_2d_preview(params, out_png)
+    s = min(600 / (x1 - x0), 300 / (y1 - y0))
+    img = Image.new('RGB', (round((x1 - x0) * s), round((y1 - y0) * s)), 'white')
+    draw = ImageDraw.Draw(img)
+    if pts is None:
+        draw.ellipse([(-r - x0) * s, (y1 - r) * s, (r - x0) * s, (y1 + r) * s], fill='lightgrey', outline='black')
+    else:
+        draw.polygon([((x - x0) * s, (y1 - y) * s) for x, y in pts], fill='lightgrey', outline='black')
+    xs, ys = _hole_positions(params)
+    hr = float(params.get('hole_diameter', 6)) / 2.0 * s
+    for cx, cy in zip(((xs - x0) * s).tolist(), ((y1 - ys) * s).tolist()):
+        draw.ellipse([cx - hr, cy - hr, cx + hr, cy + hr], fill='white', outline='black')
+    img.save(out_png, optimize=False)
+    return img
 
-def build_scad(params):
+_HOLE_GROUP = 8
+
+def _build_scad(params):
+    from solid import linear_extrude, difference, union, translate, cylinder, polygon, circle
     ptype = params['part_type']
     thickness = float(params.get('thickness', 5))
     if ptype in ('arm','trapezoid'):
@@ -133,96 +209,224 @@ def build_scad(params):
     hole_r = float(params.get('hole_diameter',6))/2.0
     hole_objs = []
     if hole_count > 0:
-        if ptype in ('arm','trapezoid'):
-            for i in range(hole_count):
-                x = (i+1) * L / (hole_count+1)
-                y = (wL + wR) / 4.0
-                hole_objs.append(translate([x, y, -1])(cylinder(r=hole_r, h=thickness + 2)))
-        elif ptype == 'rectangle':
-            for i in range(hole_count):
-                x = (i+1) * L / (hole_count+1)
-                y = W/2.0
-                hole_objs.append(translate([x, y, -1])(cylinder(r=hole_r, h=thickness + 2)))
-        elif ptype == 'circle':
-            ring_r = r*0.5
-            for i in range(hole_count):
-                ang = 2*math.pi*i/hole_count
-                x = ring_r*math.cos(ang); y = ring_r*math.sin(ang)
-                hole_objs.append(translate([x, y, -1])(cylinder(r=hole_r, h=thickness + 2)))
-    if hole_objs:
-        holes_union = union()(*hole_objs)
-        part = difference()(solid_base, holes_union)
-    else:
-        part = solid_base
+        xs, ys = _hole_positions(params)
+        cyl_proto = cylinder(r=hole_r, h=thickness + 2)
+        hole_objs = [translate([x, y, -1])(cyl_proto) for x, y in zip(xs.tolist(), ys.tolist())]
+        if hole_count > _HOLE_GROUP:
+            order = np.argsort(xs, kind='stable').tolist()
+            hole_objs = [hole_objs[i] for i in order]
+    part = solid_base
+    for i in range(0, len(hole_objs), _HOLE_GROUP):
+        part = difference()(part, union()(*hole_objs[i:i + _HOLE_GROUP]))
+    return part
+
+_SCAD_CACHE = {}
+_SCAD_CACHE_SIZE = 128
+
+def build_scad(params):
+    key = (params['part_type'], params.get('thickness', 5), params.get('length'), params.get('width_left'),
+           params.get('width_right'), params.get('rect_width'), params.get('circle_diameter'),
+           params.get('hole_count', 0), params.get('hole_diameter', 6))
+    part = _SCAD_CACHE.get(key)
+    if part is None:
+        part = _build_scad(params)
+        if len(_SCAD_CACHE) >= _SCAD_CACHE_SIZE:
+            del _SCAD_CACHE[next(iter(_SCAD_CACHE))]
+        _SCAD_CACHE[key] = part
     return part
 
 CSV_FILE = "parts_generated.csv"
+CSV_FIELDS = ("timestamp", "prompt", "part_type", "png", "scad", "stl", "net_area_mm2", "thickness_mm",
+              "volume_cm3", "material", "weight_g", "max_force_n", "target_force_n", "status")
 def append_csv(row_dict):
-    df_new = pd.DataFrame([row_dict])
-    if os.path.exists(CSV_FILE):
-        df = pd.read_csv(CSV_FILE)
-        df = pd.concat([df, df_new], ignore_index=True)
+    write_header = not os.path.exists(CSV_FILE)
+    with open(CSV_FILE, 'a', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        if write_header:
+            writer.writeheader()
+        writer.writerow(row_dict)
+
+_PART_CODES = {'arm': 0, 'trapezoid': 0, 'rectangle': 1, 'circle': 2}
+
+def _compute_metrics(part_code, L, wL, wR, rw, D, thickness, density, yield_s, target):
+    if part_code == 0:
+        net_area_mm2 = 0.5 * (wL + wR) * L
+    elif part_code == 1:
+        net_area_mm2 = L * rw
     else:
-        df = df_new
-    df.to_csv(CSV_FILE, index=False)
+        net_area_mm2 = math.pi * (D/2.0)**2
+    volume_cm3 = (net_area_mm2 * thickness) / 1000.0
+    weight_g = volume_cm3 * density
+    max_force = yield_s * net_area_mm2
+    return net_area_mm2, volume_cm3, weight_g, max_force, max_force >= target
+
+_SCAD_QUEUE = []
+_QUEUE_LOCK = threading.Lock()
+
+STL_CACHE_DIR = ".scad_cache"
 
-def run_from_prompt(prompt, save_prefix="part"):
+def _export_stl(scad_name, stl_name):
+    try:
+        with open(scad_name, 'rb') as f:
+            text = f.read()
+        if text.startswith(b'//'):
+            text = text.partition(b'\n')[2]
+        cache_stl = os.path.join(STL_CACHE_DIR, hashlib.blake2b(text, digest_size=8).hexdigest() + ".stl")
+        if os.path.exists(cache_stl):
+            shutil.copyfile(cache_stl, stl_name)
+            return True
+        subprocess.run(["openscad", "-o", stl_name, scad_name], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except Exception:
+        return False
+    try:
+        os.makedirs(STL_CACHE_DIR, exist_ok=True)
+        tmp = f"{cache_stl}.{os.getpid()}.{threading.get_ident()}"
+        shutil.copyfile(stl_name, tmp)
+        os.replace(tmp, cache_stl)
+    except OSError:
+        pass
+    return True
+
+def _mesh_stl(params, stl_name):
+    try:
+        import trimesh
+        from shapely.geometry import Point, Polygon
+    except ImportError:
+        return False
+    ptype = params['part_type']
+    thickness = float(params.get('thickness', 5))
+    try:
+        if ptype in ('arm','trapezoid'):
+            L = float(params['length']); wL = float(params['width_left']); wR = float(params['width_right'])
+            outline = Polygon([(0,0),(L,0),(L,wR),(0,wL)])
+        elif ptype == 'rectangle':
+            L = float(params['length']); W = float(params['rect_width'])
+            outline = Polygon([(0,0),(L,0),(L,W),(0,W)])
+        elif ptype == 'circle':
+            outline = Point(0, 0).buffer(float(params['circle_diameter'])/2.0, 32)
+        else:
+            return False
+        mesh = trimesh.creation.extrude_polygon(outline, height=thickness)
+        if int(params.get('hole_count',0)) > 0:
+            hole_r = float(params.get('hole_diameter',6))/2.0
+            xs, ys = _hole_positions(params)
+            holes = [trimesh.creation.cylinder(radius=hole_r, height=thickness + 2, sections=96)
+                     .apply_translation([x, y, thickness / 2]) for x, y in zip(xs.tolist(), ys.tolist())]
+            if holes:
+                mesh = trimesh.boolean.difference([mesh] + holes, engine='manifold')
+        if mesh.is_empty:
+            return False
+        mesh.export(stl_name)
+        return True
+    except Exception:
+        return False
+
+def render_batch(scad_paths, stl_paths=None):
+    scad_paths = list(scad_paths)
+    if stl_paths is None:
+        stl_paths = [os.path.splitext(s)[0] + ".stl" for s in scad_paths]
+    if len(scad_paths) > 1:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+            created = list(pool.map(_export_stl, scad_paths, stl_paths))
+    else:
+        created = list(map(_export_stl, scad_paths, stl_paths))
+    return [stl if ok else "" for stl, ok in zip(stl_paths, created)]
+
+def flush_scad_queue():
+    with _QUEUE_LOCK:
+        jobs, _SCAD_QUEUE[:] = _SCAD_QUEUE[:], []
+    pending = [(row, stl_name) for row, stl_name in jobs if not row["stl"]]
+    stls = render_batch([row["scad"] for row, _ in pending], [stl_name for _, stl_name in pending])
+    for (row, _), stl in zip(pending, stls):
+        row["stl"] = stl
+    for row, _ in jobs:
+        append_csv(row)
+    return [row for row, _ in jobs]
+
+def run_from_prompt(prompt, save_prefix="part", show=False, flush=True, preview=True, fast_preview=False):
+    from solid import scad_render_to_file
     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    params = parse_prompt(prompt)
-    if params['part_type'] in ('arm','trapezoid'):
+    params = dict(parse_prompt(prompt))
+    ptype = params['part_type']
+    if ptype in ('arm','trapezoid'):
         params.setdefault('length', 150)
         params.setdefault('width_left', 50)
         params.setdefault('width_right', int(params.get('width_left',50)*0.5))
-    elif params['part_type'] == 'rectangle':
+    elif ptype == 'rectangle':
         params.setdefault('length', 120); params.setdefault('rect_width', 40)
-    elif params['part_type'] == 'circle':
+    elif ptype == 'circle':
         params.setdefault('circle_diameter', 80)
-    png_name = f"{save_prefix}_{timestamp}.png"
-    scad_name = f"{save_prefix}_{timestamp}.scad"
-    generate_2d_preview(params, png_name)
+    base = os.path.abspath(f"{save_prefix}_{timestamp}")
+    png_name = base + ".png" if preview else ""
+    scad_name = base + ".scad"
+    preview_img = None
+    if preview:
+        if fast_preview:
+            preview_img = _fast_preview(params, png_name)
+        else:
+            preview_img = generate_2d_preview(params, png_name)
     part = build_scad(params)
     scad_render_to_file(part, scad_name, file_header='$fn = 96;')
-    stl_name = scad_name.replace('.scad', '.stl')
-    try:
-        subprocess.run(["openscad", "-o", stl_name, scad_name], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        stl_created = True
-    except Exception:
-        stl_created = False
-    if params['part_type'] in ('arm','trapezoid'):
-        net_area_mm2 = 0.5 * (params['width_left'] + params['width_right']) * params['length']
-    elif params['part_type'] == 'rectangle':
-        net_area_mm2 = params['length'] * params['rect_width']
-    else:
-        net_area_mm2 = math.pi * (params['circle_diameter']/2.0)**2
+    stl_name = base + ".stl"
+    stl_ok = _mesh_stl(params, stl_name)
     thickness = params.get('thickness', 5)
-    volume_cm3 = (net_area_mm2 * thickness) / 1000.0
-    density = 2.7 if params.get('material','aluminum')=='aluminum' else 7.85
-    weight_g = volume_cm3 * density
-    yield_strength = 150 if params.get('material','aluminum')=='aluminum' else 250
-    max_force = yield_strength * net_area_mm2
-    status = "PASS" if max_force >= params.get('target_force_n', 2000) else "FAIL"
+    material = params.get('material', 'aluminum')
+    target = params.get('target_force_n', 2000)
+    density = MATERIAL_DENSITY.get(material, 2.7)
+    yield_strength = MATERIAL_YIELD_STRENGTH.get(material, 150)
+    net_area_mm2, volume_cm3, weight_g, max_force, passed = _compute_metrics(
+        _PART_CODES.get(ptype, 2), params.get('length', 0),
+        params.get('width_left', 0), params.get('width_right', 0), params.get('rect_width', 0),
+        params.get('circle_diameter', 0), thickness, density, yield_strength, target)
+    status = "PASS" if passed else "FAIL"
     row = {
         "timestamp": timestamp,
         "prompt": prompt,
-        "part_type": params['part_type'],
-        "png": os.path.abspath(png_name),
-        "scad": os.path.abspath(scad_name),
-        "stl": os.path.abspath(stl_name) if stl_created else "",
+        "part_type": ptype,
+        "png": png_name,
+        "scad": scad_name,
+        "stl": stl_name if stl_ok else "",
         "net_area_mm2": net_area_mm2,
         "thickness_mm": thickness,
         "volume_cm3": volume_cm3,
-        "material": params.get('material'),
+        "material": material,
         "weight_g": weight_g,
         "max_force_n": max_force,
-        "target_force_n": params.get('target_force_n'),
+        "target_force_n": target,
         "status": status
     }
-    append_csv(row)
+    with _QUEUE_LOCK:
+        _SCAD_QUEUE.append((row, stl_name))
+    if flush:
+        flush_scad_queue()
     print("=== Generated summary ===")
     for k,v in row.items():
         print(f"{k}: {v}")
-    img = plt.imread(png_name)
-    plt.figure(figsize=(8,4)); plt.imshow(img); plt.axis('off'); plt.show()
+    if show and preview:
+        import matplotlib.pyplot as plt
+        plt.figure(figsize=(8,4)); plt.imshow(np.asarray(preview_img)); plt.axis('off'); plt.show()
+
+def _batch_job(prompt, save_prefix, preview):
+    with _QUEUE_LOCK:
+        start = len(_SCAD_QUEUE)
+    run_from_prompt(prompt, save_prefix=save_prefix, flush=False, preview=preview)
+    with _QUEUE_LOCK:
+        jobs, _SCAD_QUEUE[start:] = _SCAD_QUEUE[start:], []
+    return jobs
+
+def run_batch(prompts, save_prefix="part", preview=False):
+    args = [(p, f"{save_prefix}_{i:03d}", preview) for i, p in enumerate(prompts)]
+    if len(args) > 1:
+        from multiprocessing import Pool
+        with Pool(os.cpu_count()) as pool:
+            results = pool.starmap(_batch_job, args)
+    else:
+        results = [_batch_job(*a) for a in args]
+    with _QUEUE_LOCK:
+        for jobs in results:
+            _SCAD_QUEUE.extend(jobs)
+    return flush_scad_queue()
 
 if __name__ == "__main__":
     example_prompts = [
@@ -233,11 +437,16 @@ if __name__ == "__main__":
     for i,p in enumerate(example_prompts,1):
         print(f"{i}. {p}")
     print("0. Enter custom prompt")
-    choice = input("Enter choice [0-2]: ").strip()
-    if choice == '0':
-        prompt = input("Paste prompt: ").strip()
-    elif choice in ('1','2'):
-        prompt = example_prompts[int(choice)-1]
+    print("a. Generate all examples")
+    choice = input("Enter choice [0-2, a]: ").strip()
+    if choice == 'a':
+        for row in run_batch(example_prompts, save_prefix="part", preview=True):
+            print(f"{row['part_type']}: {row['scad']} {row['stl'] or '(no STL)'}")
     else:
-        prompt = example_prompts[0]
-    run_from_prompt(prompt, save_prefix="part")
\ No newline at end of file
+        if choice == '0':
+            prompt = input("Paste prompt: ").strip()
+        elif choice in ('1','2'):
+            prompt = example_prompts[int(choice)-1]
+        else:
+            prompt = example_prompts[0]
+        run_from_prompt(prompt, save_prefix="part", show=True)
\ No newline at end of file